@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 
 from google.cloud.bigquery import Client, SchemaField
 from google.cloud.bigquery.table import RowIterator
@@ -7,7 +7,7 @@ import bigquery_frame
 from bigquery_frame.auth import get_bq_client
 from bigquery_frame.dataframe import DEFAULT_ALIAS_NAME, DEFAULT_TEMP_TABLE_NAME
 from bigquery_frame.has_bigquery_client import HasBigQueryClient
-from bigquery_frame.utils import indent, quote, strip_margin
+from bigquery_frame.utils import quote, wrap_cte
 
 if TYPE_CHECKING:
     from bigquery_frame import DataFrame
@@ -21,6 +21,8 @@ class BigQueryBuilder(HasBigQueryClient):
         self._alias_count = 0
         self._temp_table_count = 0
         self._views: Dict[str, "DataFrame"] = {}
+        self._view_ctes: Dict[str, str] = {}
+        self._views_version = 0
         self._temp_tables: Set[str] = set()
         self.debug = debug
 
@@ -44,12 +46,21 @@ class BigQueryBuilder(HasBigQueryClient):
         query = self._generate_header() + query
         return super()._get_query_schema(query)
 
+    def _compute_schemas(self, dfs: Iterable["DataFrame"]) -> None:
+        """Fetches the schemas of all the given DataFrames that are not known yet, with concurrent queries."""
+        dfs_to_compute = list({id(df): df for df in dfs if df._schema is None}.values())
+        schemas = self._get_query_schemas([df.compile() for df in dfs_to_compute])
+        for df, schema in zip(dfs_to_compute, schemas):
+            df._schema = schema
+
     def _execute_query(self, query: str, use_query_cache=True) -> RowIterator:
         query = self._generate_header() + query
         return super()._execute_query(query, use_query_cache=use_query_cache)
 
     def _registerDataFrameAsTempView(self, df: "DataFrame", alias: str) -> None:
         self._views[alias] = df
+        self._view_ctes.pop(alias, None)
+        self._views_version += 1
 
     def _registerDataFrameAsTempTable(self, df: "DataFrame", alias: Optional[str] = None) -> "DataFrame":
         if alias is None:
@@ -58,15 +69,16 @@ class BigQueryBuilder(HasBigQueryClient):
         self._execute_query(query)
         return self.table(alias)
 
+    def _compile_view(self, alias: str) -> str:
+        """Returns the CTE defining the view with the given alias.
+        It is cached until the view is replaced, to avoid re-compiling and re-indenting the whole view every time.
+        """
+        if alias not in self._view_ctes:
+            self._view_ctes[alias] = wrap_cte(quote(alias), self._views[alias]._compile_with_deps())
+        return self._view_ctes[alias]
+
     def _compile_views(self) -> Dict[str, str]:
-        return {
-            alias: strip_margin(
-                f"""{quote(alias)} AS (
-                |{indent(df._compile_with_deps(), 2)}
-                |)"""
-            )
-            for alias, df in self._views.items()
-        }
+        return {alias: self._compile_view(alias) for alias in self._views}
 
     def _get_alias(self) -> str:
         self._alias_count += 1
@@ -86,6 +98,5 @@ class BigQueryBuilder(HasBigQueryClient):
         :return: None
         :raises: an Exception if something that does not comply with BigQuery's rules is found.
         """
-        collisions = [alias for alias, df in list(self._views.items()) + deps if alias == new_alias]
-        if len(collisions) > 0:
+        if new_alias in self._views or any(alias == new_alias for alias, df in deps):
             raise ValueError(f"Duplicate alias {new_alias}")
@@ -2,18 +2,21 @@ from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 from bigquery_frame.conf import ELEMENT_COL_NAME
 from bigquery_frame.exceptions import IllegalArgumentException
-from bigquery_frame.utils import indent, lit_to_col, quote, str_to_col, strip_margin
+from bigquery_frame.utils import lit_to_col, quote, str_to_col, strip_margin
 
 LitOrColumn = Union[object, "Column"]
 StringOrColumn = Union[str, "Column"]
 
 
 def cols_to_str(cols: Iterable[StringOrColumn], indentation: Optional[int] = None, sep: str = ",") -> str:
-    str_cols = [str(col) for col in cols]
     if indentation is not None:
-        return indent(f"{sep}\n".join(str_cols), indentation)
+        # Indenting while joining avoids a second pass over the whole joined string.
+        # Multi-line columns still need their own inner lines indented.
+        pad = " " * indentation
+        newline_pad = "\n" + pad
+        return pad + f"{sep}{newline_pad}".join(str(col).replace("\n", newline_pad) for col in cols)
     else:
-        return ", ".join(str_cols)
+        return ", ".join(str(col) for col in cols)
 
 
 def literal_col(val: LitOrColumn) -> "Column":
@@ -50,6 +53,8 @@ def _func_op(op: str) -> Callable[["Column"], "Column"]:
 
 
 class Column:
+    __slots__ = ("_expr", "_alias")
+
     def __init__(self, expr: str):
         self._expr: str = expr
         self._alias: Optional[str] = None
@@ -372,6 +377,8 @@ class Column:
 
 
 class WhenColumn(Column):
+    __slots__ = ("_when_condition",)
+
     def __init__(self, when_condition: List[Tuple["Column", "Column"]]):
         super().__init__("")
         self._when_condition: List[Tuple["Column", "Column"]] = when_condition
@@ -457,6 +464,8 @@ class WhenColumn(Column):
 
 
 class ArrayColumn(Column):
+    __slots__ = ("_array", "_transform_col", "_sort_cols")
+
     def __init__(
         self, array: Column, transform_col: Column = Column("*"), sort_cols: Optional[Union[List[Column]]] = None
     ) -> None:
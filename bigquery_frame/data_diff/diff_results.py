@@ -10,7 +10,7 @@ from bigquery_frame.data_diff.package import (
     IS_EQUAL_COL_NAME,
     Predicates,
 )
-from bigquery_frame.utils import quote, str_to_cols, strip_margin
+from bigquery_frame.utils import str_to_cols, strip_margin
 
 
 class SchemaDiffResult:
@@ -124,13 +124,13 @@ class DiffResult:
             + [first_df[EXISTS_COL_NAME], is_equal.alias(IS_EQUAL_COL_NAME)]
         )
         on_str = ", ".join(join_cols)
-        join_str = "\nJOIN ".join([f"{quote(df._alias)} USING ({on_str})" for df in other_dfs])
+        join_str = "\nJOIN ".join([f"{df._quoted_alias} USING ({on_str})" for df in other_dfs])
 
         query = strip_margin(
             f"""
             |SELECT
             |{cols_to_str(selected_columns, 2)}
-            |FROM {quote(first_df._alias)}
+            |FROM {first_df._quoted_alias}
             |JOIN {join_str}"""
         )
         return first_df._apply_query(query, deps=[first_df, *other_dfs])
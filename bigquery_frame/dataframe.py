@@ -8,7 +8,6 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
-    TypeVar,
     Union,
 )
 
@@ -19,14 +18,11 @@ from bigquery_frame.column import Column, StringOrColumn, cols_to_str
 from bigquery_frame.conf import ELEMENT_COL_NAME, REPETITION_MARKER, STRUCT_SEPARATOR
 from bigquery_frame.nested import resolve_nested_columns
 from bigquery_frame.printing import print_results
-from bigquery_frame.utils import assert_true, indent, quote, str_to_cols, strip_margin
+from bigquery_frame.utils import assert_true, quote, str_to_cols, strip_margin, wrap_cte
 
 if TYPE_CHECKING:
     from bigquery_frame.bigquery_builder import BigQueryBuilder
 
-A = TypeVar("A")
-B = TypeVar("B")
-
 DEFAULT_ALIAS_NAME = "_default_alias_{num}"
 DEFAULT_TEMP_TABLE_NAME = "_default_temp_table_{num}"
 DEFAULT_TEMP_COLUMN_NAME = "_default_temp_column_{num}"
@@ -101,41 +97,60 @@ def schema_to_simple_string(schema: List[SchemaField]):
     return f"{cols_to_string}"
 
 
-def schema_to_tree_string(schema: List[SchemaField]) -> str:
-    """Generates a string representing the schema in tree format"""
+_TREE_STRING_PREFIXES = [" |-- "]
 
-    def str_gen_schema_field(schema_field: SchemaField, prefix: str) -> List[str]:
-        res = [f"{prefix}{schema_field.name}: {schema_field.field_type} ({schema_field.mode})"]
-        if is_struct(schema_field):
-            res += str_gen_schema(schema_field.fields, " |   " + prefix)
-        return res
 
-    def str_gen_schema(schema: List[SchemaField], prefix: str) -> List[str]:
-        return [str for schema_field in schema for str in str_gen_schema_field(schema_field, prefix)]
+def _tree_string_prefix(depth: int) -> str:
+    """Returns the prefix of a field at the given depth in a tree string, computing it only once per depth."""
+    while len(_TREE_STRING_PREFIXES) <= depth:
+        _TREE_STRING_PREFIXES.append(" |   " + _TREE_STRING_PREFIXES[-1])
+    return _TREE_STRING_PREFIXES[depth]
 
-    res = ["root"] + str_gen_schema(schema, " |-- ")
 
+def schema_to_tree_string(schema: List[SchemaField]) -> str:
+    """Generates a string representing the schema in tree format"""
+    res = ["root"]
+    stack = [(schema_field, 0) for schema_field in reversed(schema)]
+    while len(stack) > 0:
+        schema_field, depth = stack.pop()
+        res.append(f"{_tree_string_prefix(depth)}{schema_field.name}: {schema_field.field_type} ({schema_field.mode})")
+        if is_struct(schema_field):
+            stack.extend((child_field, depth + 1) for child_field in reversed(schema_field.fields))
     return "\n".join(res) + "\n"
 
 
-def _dedup_key_value_list(items: List[Tuple[A, B]]) -> List[Tuple[A, B]]:
-    """Deduplicate a list of key, values by their keys.
-    Unlike `list(set(l))`, this does preserve ordering.
+def _merge_deps(deps: Sequence["DataFrame"]) -> List[Tuple[str, "DataFrame"]]:
+    """Merges the dependencies of the given DataFrames with the DataFrames themselves, deduplicated by alias.
+    The dependencies of the DataFrames come first, then the DataFrames. When an alias is found several times,
+    it keeps the position where it was first found and the DataFrame that was found last.
 
-    Example:
-    >>> _dedup_key_value_list([('a', 1), ('b', 2), ('a', 3)])
-    [('a', 3), ('b', 2)]
-
-    :param items: an iterable of couples
-    :return: an iterable of couples
+    :param deps: the DataFrames that a new DataFrame depends on. It is iterated twice, so it must not be a generator
+    :return: a list of couples (alias, DataFrame)
     """
-    return list({k: v for k, v in items}.items())
+    deps_dict: Dict[str, "DataFrame"] = {}
+    for df in deps:
+        deps_dict.update(df._deps)
+    for df in deps:
+        deps_dict[df._alias] = df
+    return list(deps_dict.items())
 
 
 class DataFrame:
+    __slots__ = (
+        "query",
+        "_deps",
+        "_alias",
+        "_quoted_alias",
+        "bigquery",
+        "_schema",
+        "_cte_sql",
+        "_tree_string",
+        "_compiled",
+    )
 
     _deps: List[Tuple[str, "DataFrame"]]
     _alias: str
+    _quoted_alias: str
 
     def __init__(
         self, query: str, alias: Optional[str], bigquery: "BigQueryBuilder", deps: Optional[List["DataFrame"]] = None
@@ -143,15 +158,18 @@ class DataFrame:
         self.query = query
         if deps is None:
             deps = []
-        deps_with_aliases = [dep for df in deps for dep in df._deps] + [(df._alias, df) for df in deps]
-        self._deps: List[Tuple[str, "DataFrame"]] = _dedup_key_value_list(deps_with_aliases)
+        self._deps: List[Tuple[str, "DataFrame"]] = _merge_deps(deps)
         if alias is None:
             alias = bigquery._get_alias()
         else:
             bigquery._check_alias(alias, self._deps)
         self._alias = alias
+        self._quoted_alias = quote(alias)
         self.bigquery: "BigQueryBuilder" = bigquery
         self._schema: Optional[List[SchemaField]] = None
+        self._cte_sql: Optional[str] = None
+        self._tree_string: Optional[str] = None
+        self._compiled: Optional[Tuple[int, str]] = None
         if self.bigquery.debug:
             self.__validate()
 
@@ -202,13 +220,13 @@ class DataFrame:
         +----+----------+
         """
         if isinstance(item, str):
-            return Column(f"{quote(self._alias)}.{quote(item)}")
+            return Column(f"{self._quoted_alias}.{quote(item)}")
         elif isinstance(item, Column):
             return self.filter(item)
         elif isinstance(item, Iterable):
             return self.select(*item)
         elif isinstance(item, int):
-            return Column(f"{quote(self._alias)}.{quote(self.schema[item].name)}")
+            return Column(f"{self._quoted_alias}.{quote(self.schema[item].name)}")
         else:
             raise TypeError("unexpected item type: %s" % type(item))
 
@@ -220,21 +238,22 @@ class DataFrame:
     def _compute_schema(self) -> List[SchemaField]:
         return self.bigquery._get_query_schema(self.compile())
 
+    def _as_cte(self) -> str:
+        """Returns the definition of this :class:`DataFrame` as a CTE.
+        It only depends on the query and the alias, so it is computed once and reused by all the descendants.
+        """
+        if self._cte_sql is None:
+            self._cte_sql = wrap_cte(self._quoted_alias, self.query)
+        return self._cte_sql
+
     def _compile_deps(self) -> Dict[str, str]:
-        return {
-            alias: strip_margin(
-                f"""{quote(alias)} AS (
-                |{indent(cte.query, 2)}
-                |)"""
-            )
-            for (alias, cte) in self._deps
-        }
+        return {alias: cte._as_cte() for (alias, cte) in self._deps}
 
-    def _compile_with_ctes(self, ctes: Dict[str, str]) -> str:
-        if len(ctes) > 0:
-            query = "WITH " + "\n, ".join(ctes.values()) + "\n" + self.query
-        else:
+    def _compile_with_ctes(self, ctes: Dict[str, str], query: Optional[str] = None) -> str:
+        if query is None:
             query = self.query
+        if len(ctes) > 0:
+            query = "WITH " + "\n, ".join(ctes.values()) + "\n" + query
         deps_replacements = {
             alias[1:-1]: DEFAULT_ALIAS_NAME.format(num=i + 1)
             for (i, (alias, _)) in enumerate(ctes.items())
@@ -262,23 +281,67 @@ class DataFrame:
         """Returns a new :class:`DataFrame` with an alias set."""
         return DataFrame(self.query, alias, self.bigquery, deps=[df for alias, df in self._deps])
 
+    def _collect_with_limit(self, num: int) -> RowIterator:
+        """Returns the first ``num`` records as :class:`RowIterator`.
+        This is equivalent to `self.limit(num).collect_iterator()`, without creating an intermediary DataFrame.
+        """
+        query = f"SELECT * FROM {self._quoted_alias} LIMIT {num}"
+        ctes = {**self.bigquery._compile_views(), **self._compile_deps(), self._alias: self._as_cte()}
+        res = self.bigquery._execute_query(self._compile_with_ctes(ctes, query))
+        if self._schema is None:
+            self._schema = res.schema
+        return res
+
     def collect(self) -> List[Row]:
         """Returns all the records as list of :class:`Row`."""
-        return list(self.bigquery._execute_query(self.compile()))
+        return list(self.collect_iterator())
+
+    def collect_arrow(self, **kwargs):
+        """Returns all the records as a :class:`pyarrow.Table`.
+
+        This method requires to have the extra dependency pyarrow installed.
+
+        Optional extra arguments (kwargs) will be passed directly to the
+        :func:`bigquery.table.RowIterator.to_arrow` method.
+        Please check its documentation for further information.
+
+        By default, the BigQuery client will use the BigQuery Storage API to download data faster, as columnar
+        batches that are not converted into Python :class:`Row` objects.
+        This requires to have the extra role "BigQuery Read Session User".
+        You can disable this behavior and use the regular, slower download method (which does not require additionnal
+        rights) by passing the argument `create_bqstorage_client=False`.
+
+        >>> df = __get_test_df()
+        >>> table = df.collect_arrow()
+        >>> type(table)
+        <class 'pyarrow.lib.Table'>
+        >>> table.to_pydict()
+        {'id': [1, 2, 3], 'name': ['Bulbasaur', 'Ivysaur', 'Venusaur']}
+
+        """
+        return self.collect_iterator().to_arrow(**kwargs)
 
     def collect_iterator(self) -> RowIterator:
         """Returns all the records as :class:`RowIterator`."""
-        return self.bigquery._execute_query(self.compile())
+        res = self.bigquery._execute_query(self.compile())
+        if self._schema is None:
+            # The query's results already carry the schema, this spares a call to BigQuery if it is needed later
+            self._schema = res.schema
+        return res
 
     def count(self) -> int:
         """Returns the number of rows in this :class:`DataFrame`."""
-        query = f"SELECT COUNT(1) FROM {quote(self._alias)}"
+        query = f"SELECT COUNT(1) FROM {self._quoted_alias}"
         return self._apply_query(query).collect()[0][0]
 
     def compile(self) -> str:
         """Returns the sql query that will be executed to materialize this :class:`DataFrame`"""
-        ctes = {**self.bigquery._compile_views(), **self._compile_deps()}
-        return self._compile_with_ctes(ctes)
+        # The compiled query is cached as long as no temp view is registered or replaced
+        views_version = self.bigquery._views_version
+        if self._compiled is None or self._compiled[0] != views_version:
+            ctes = {**self.bigquery._compile_views(), **self._compile_deps()}
+            self._compiled = (views_version, self._compile_with_ctes(ctes))
+        return self._compiled[1]
 
     def createOrReplaceTempTable(self, alias: str) -> None:
         """Creates or replace a persisted temporary table.
@@ -349,7 +412,7 @@ class DataFrame:
         -----------------------------
         In BigQuery, the DISTINCT statement does not work on complex types like STRUCT and ARRAY.
         """
-        query = f"""SELECT DISTINCT * FROM {quote(self._alias)}"""
+        query = f"""SELECT DISTINCT * FROM {self._quoted_alias}"""
         return self._apply_query(query)
 
     def drop(self, *cols: str) -> "DataFrame":
@@ -358,21 +421,12 @@ class DataFrame:
         """
         schema_cols = set(self.columns)
         cols_in_schema = [col for col in cols if col in schema_cols]
-        query = strip_margin(
-            f"""SELECT
-            |  * EXCEPT ({cols_to_str(cols_in_schema)})
-            |FROM {quote(self._alias)}"""
-        )
+        query = f"SELECT\n  * EXCEPT ({cols_to_str(cols_in_schema)})\nFROM {self._quoted_alias}"
         return self._apply_query(query)
 
     def filter(self, condition: StringOrColumn) -> "DataFrame":
         """Filters rows using the given condition."""
-        query = strip_margin(
-            f"""
-            |SELECT *
-            |FROM {quote(self._alias)}
-            |WHERE {str(condition)}"""
-        )
+        query = f"SELECT *\nFROM {self._quoted_alias}\nWHERE {str(condition)}"
         return self._apply_query(query)
 
     def join(
@@ -567,19 +621,20 @@ class DataFrame:
             where_str = f"WHERE {other_short_alias}.{anti_join_presence_col_name} IS NULL"
         else:
             where_str = ""
-        query = strip_margin(
-            f"""
-            |SELECT
-            |{cols_to_str(selected_columns, 2)}
-            |FROM {quote(self._alias)}
-            |{join_str} {quote(other._alias)}{on_clause}
-            |{where_str}"""
+        query = "\n".join(
+            [
+                "SELECT",
+                cols_to_str(selected_columns, 2),
+                f"FROM {self._quoted_alias}",
+                f"{join_str} {other._quoted_alias}{on_clause}",
+                where_str,
+            ]
         )
         return self._apply_query(query, deps=[self, other])
 
     def limit(self, num: int) -> "DataFrame":
         """Returns a new :class:`DataFrame` with a result count limited to the specified number of rows."""
-        query = f"""SELECT * FROM {quote(self._alias)} LIMIT {num}"""
+        query = f"""SELECT * FROM {self._quoted_alias} LIMIT {num}"""
         return self._apply_query(query)
 
     def persist(self) -> "DataFrame":
@@ -652,11 +707,7 @@ class DataFrame:
                 raise TypeError(f"Wrong argument type: {type(columns)}")
         else:
             cols = typing.cast(Tuple[StringOrColumn], columns)
-        query = strip_margin(
-            f"""SELECT
-            |{cols_to_str(cols, 2)}
-            |FROM {quote(self._alias)}"""
-        )
+        query = f"SELECT\n{cols_to_str(cols, 2)}\nFROM {self._quoted_alias}"
         return self._apply_query(query)
 
     def select_nested_columns(self, columns: Mapping[str, StringOrColumn]) -> "DataFrame":
@@ -764,7 +815,7 @@ class DataFrame:
         :param format_args: extra arguments that may be passed to the function tabulate.tabulate()
         :return: Nothing
         """
-        res = self.limit(n + 1).collect_iterator()
+        res = self._collect_with_limit(n + 1)
         print_results(res, format_args, limit=n)
 
     def sort(self, *cols: StringOrColumn):
@@ -801,17 +852,12 @@ class DataFrame:
         :return:
         """
         str_cols = [col.expr for col in str_to_cols(cols)]
-        query = strip_margin(
-            f"""
-            |SELECT *
-            |FROM {quote(self._alias)}
-            |ORDER BY {cols_to_str(str_cols)}"""
-        )
+        query = f"SELECT *\nFROM {self._quoted_alias}\nORDER BY {cols_to_str(str_cols)}"
         return self._apply_query(query)
 
     def take(self, num):
         """Returns the first ``num`` rows as a :class:`list` of :class:`Row`."""
-        return self.limit(num).collect()
+        return list(self._collect_with_limit(num))
 
     def toPandas(self, **kwargs):
         """Returns the contents of this :class:`DataFrame` as Pandas :class:`pandas.DataFrame`.
@@ -846,7 +892,9 @@ class DataFrame:
 
     def treeString(self):
         """Generates a string representing the schema in tree format"""
-        return schema_to_tree_string(self.schema)
+        if self._tree_string is None:
+            self._tree_string = schema_to_tree_string(self.schema)
+        return self._tree_string
 
     def union(self, other: "DataFrame") -> "DataFrame":
         """Return a new :class:`DataFrame` containing union of rows in this and another :class:`DataFrame`.
@@ -860,7 +908,7 @@ class DataFrame:
         :param other:
         :return: a new :class:`DataFrame`
         """
-        query = f"""SELECT * FROM {quote(self._alias)} UNION ALL SELECT * FROM {quote(other._alias)}"""
+        query = f"""SELECT * FROM {self._quoted_alias} UNION ALL SELECT * FROM {other._quoted_alias}"""
         return self._apply_query(query, deps=[self, other])
 
     def unionByName(self, other: "DataFrame", allowMissingColumns: bool = False) -> "DataFrame":
@@ -915,40 +963,48 @@ class DataFrame:
           they are added to the other DataFrame as null values.
         :return: a new :class:`DataFrame`
         """
+        self.bigquery._compute_schemas([self, other])
         self_cols = self.columns
         other_cols = other.columns
-        self_cols_set = set(self.columns)
-        other_cols_set = set(other.columns)
-
-        self_only_cols = [col for col in self_cols if col not in other_cols_set]
-        common_cols = [col for col in self_cols if col in other_cols_set]
+        self_cols_set = set(self_cols)
+        other_cols_set = set(other_cols)
+
+        self_only_cols: List[str] = []
+        common_cols: List[str] = []
+        for col in self_cols:
+            if col in other_cols_set:
+                common_cols.append(col)
+            else:
+                self_only_cols.append(col)
         other_only_cols = [col for col in other_cols if col not in self_cols_set]
 
         if (len(self_only_cols) > 0 or len(other_only_cols) > 0) and not allowMissingColumns:
             raise ValueError(
                 f"UnionByName: dataFrames must have the same columns, "
                 f"unless allowMissingColumns is set to True.\n"
-                f"Columns in first DataFrame: [{cols_to_str(self.columns)}]\n"
-                f"Columns in second DataFrame: [{cols_to_str(other.columns)}]"
+                f"Columns in first DataFrame: [{cols_to_str(self_cols)}]\n"
+                f"Columns in second DataFrame: [{cols_to_str(other_cols)}]"
             )
 
         def optional_comma(_list: Sequence[object]):
             return "," if len(_list) > 0 else ""
 
-        query = strip_margin(
-            f"""
-            |SELECT
-            |  {cols_to_str(self_only_cols, 2)}{optional_comma(self_only_cols)}
-            |  {cols_to_str(common_cols, 2)}{optional_comma(common_cols)}
-            |  {cols_to_str([f"NULL as {col}" for col in other_only_cols], 2)}
-            |FROM {quote(self._alias)}
-            |UNION ALL
-            |SELECT
-            |  {cols_to_str([f"NULL as {col}" for col in self_only_cols], 2)}{optional_comma(self_only_cols)}
-            |  {cols_to_str(common_cols, 2)}{optional_comma(common_cols)}
-            |  {cols_to_str(other_only_cols, 2)}
-            |FROM {quote(other._alias)}
-            |"""
+        common_cols_str = cols_to_str(common_cols, 2) + optional_comma(common_cols)
+        query = "\n".join(
+            [
+                "SELECT",
+                "  " + cols_to_str(self_only_cols, 2) + optional_comma(self_only_cols),
+                "  " + common_cols_str,
+                "  " + cols_to_str([f"NULL as {col}" for col in other_only_cols], 2),
+                f"FROM {self._quoted_alias}",
+                "UNION ALL",
+                "SELECT",
+                "  " + cols_to_str([f"NULL as {col}" for col in self_only_cols], 2) + optional_comma(self_only_cols),
+                "  " + common_cols_str,
+                "  " + cols_to_str(other_only_cols, 2),
+                f"FROM {other._quoted_alias}",
+                "",
+            ]
         )
         return self._apply_query(query, deps=[self, other])
 
@@ -972,9 +1028,9 @@ class DataFrame:
         :return: a new :class:`DataFrame`
         """
         if replace:
-            query = f"SELECT * REPLACE ({col_expr} AS {col_name}) FROM {quote(self._alias)}"
+            query = f"SELECT * REPLACE ({col_expr} AS {col_name}) FROM {self._quoted_alias}"
         else:
-            query = f"SELECT *, {col_expr} AS {col_name} FROM {quote(self._alias)}"
+            query = f"SELECT *, {col_expr} AS {col_name} FROM {self._quoted_alias}"
         return self._apply_query(query)
 
     def with_nested_columns(self, columns: Dict[str, StringOrColumn]) -> "DataFrame":
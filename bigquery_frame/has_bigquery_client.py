@@ -1,6 +1,8 @@
 import copy
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Callable, List, Optional, TypeVar, cast
 
@@ -85,6 +87,8 @@ class HasBigQueryClient:
         self.__client = client
         self.__session_id: Optional[str] = None
         self.__stats: BigQueryStats = BigQueryStats()
+        # Jobs may run in multiple threads (see _get_query_schemas), the stats must be updated by one at a time
+        self.__stats_lock = threading.Lock()
 
     def _get_session_id_after_query(self, job):
         if self.__use_session and self.__session_id is None and job.session_info is not None:
@@ -92,10 +96,12 @@ class HasBigQueryClient:
 
     def _set_session_id_before_query(self, job_config):
         if self.__use_session:
-            if self.__session_id is None:
-                job_config.create_session = True
-            else:
+            if self.__session_id is not None:
                 job_config.connection_properties = [ConnectionProperty("session_id", self.__session_id)]
+            elif not job_config.dry_run:
+                # Dry runs never need to open the session: temporary tables can only exist in a session
+                # after a real query has been run in it, and such a query always opens the session first.
+                job_config.create_session = True
 
     def _execute_job(
         self,
@@ -123,7 +129,8 @@ class HasBigQueryClient:
             else:
                 raise e
         else:
-            self.__stats.add_job_stats(job)
+            with self.__stats_lock:
+                self.__stats.add_job_stats(job)
             return res
         print(f"Retrying query (Try n°{try_count}/{self.max_try_count})", file=sys.stderr)
         return self._execute_job(query, action, dry_run=dry_run, use_query_cache=use_query_cache, try_count=try_count)
@@ -134,6 +141,17 @@ class HasBigQueryClient:
 
         return self._execute_job(query, action, dry_run=True, use_query_cache=False)
 
+    def _get_query_schemas(self, queries: List[str]) -> List[List[SchemaField]]:
+        """Get the schemas of multiple queries, sending the dry-run jobs concurrently.
+
+        :param queries: A list of SQL queries
+        :return: The schema of each query, in the same order as the queries
+        """
+        if len(queries) == 0:
+            return []
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            return list(executor.map(self._get_query_schema, queries))
+
     def _execute_query(self, query: str, use_query_cache=True) -> RowIterator:
         def action(job: QueryJob) -> RowIterator:
             return job.result()
@@ -145,4 +163,5 @@ class HasBigQueryClient:
 
     @property
     def stats(self):
-        return copy.copy(self.__stats)
+        with self.__stats_lock:
+            return copy.copy(self.__stats)
@@ -7,10 +7,9 @@ from bigquery_frame import functions as f
 from bigquery_frame.auth import get_bq_client
 from bigquery_frame.column import Column, StringOrColumn, cols_to_str
 from bigquery_frame.data_type_utils import flatten_schema
-from bigquery_frame.dataframe import strip_margin
 from bigquery_frame.transformations_impl import analyze_aggs
 from bigquery_frame.transformations_impl.union_dataframes import union_dataframes
-from bigquery_frame.utils import quote
+from bigquery_frame.utils import quote, strip_margin
 
 
 def _unnest_column(df: DataFrame, col: str, extra_cols: Optional[List[Column]] = None):
@@ -94,7 +93,7 @@ def _unnest_column(df: DataFrame, col: str, extra_cols: Optional[List[Column]] =
             f"""
             |SELECT
             |  {cols_to_str(extra_cols + [f.expr(col)], 2)}
-            |FROM {quote(df._alias)}
+            |FROM {df._quoted_alias}
             |{cross_join_str}"""
         )
         return df._apply_query(query)
@@ -110,7 +109,7 @@ def _select_group_by(df: DataFrame, *columns: StringOrColumn, group_by: List[Col
     query = strip_margin(
         f"""SELECT
         |{cols_to_str(columns, 2)}
-        |FROM {quote(df._alias)}{group_by_str}"""
+        |FROM {df._quoted_alias}{group_by_str}"""
     )
     return df._apply_query(query)
 
@@ -331,7 +330,7 @@ def analyze(
         union_df = union_dataframes(big_dfs)
     # For some reason, `union_df.orderBy("column_number").drop("column_number")`
     # does not preserve the ordering, but this does:
-    query = f"""SELECT * FROM {quote(union_df._alias)} ORDER BY column_number"""
+    query = f"""SELECT * FROM {union_df._quoted_alias} ORDER BY column_number"""
     return union_df._apply_query(query)
 
 
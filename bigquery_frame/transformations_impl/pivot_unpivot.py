@@ -2,8 +2,7 @@ from typing import List
 
 from bigquery_frame import BigQueryBuilder, DataFrame
 from bigquery_frame.column import cols_to_str
-from bigquery_frame.dataframe import strip_margin
-from bigquery_frame.utils import quote
+from bigquery_frame.utils import strip_margin
 
 
 def pivot(
@@ -90,7 +89,7 @@ def pivot_v1(
 ) -> DataFrame:
     """This version uses a good old GROUP BY statement and should be compatible with most ANSI-SQL engines."""
     group_columns = [col for col in df.columns if col.lower() not in [agg_col.lower(), pivot_column.lower()]]
-    distinct_query = f"""SELECT DISTINCT {pivot_column} FROM {quote(df._alias)}"""
+    distinct_query = f"""SELECT DISTINCT {pivot_column} FROM {df._quoted_alias}"""
     if pivoted_columns is None:
         pivoted_columns = [row.get(pivot_column) for row in df._apply_query(distinct_query).collect()]
 
@@ -101,7 +100,7 @@ def pivot_v1(
         |SELECT
         |{cols_to_str(group_columns, 2)},
         |{cols_to_str(aggregates, 2)}
-        |FROM {quote(df._alias)}
+        |FROM {df._quoted_alias}
         |GROUP BY {cols_to_str(group_columns)}
         |"""
     )
@@ -118,7 +117,7 @@ def pivot_v2(
     """This version uses BigQuery's
     `PIVOT operator <https://cloud.google.com/bigquery/docs/reference/standard-sql/query-syntax#pivot_operator>`_
     """
-    distinct_query = f"""SELECT DISTINCT {pivot_column} FROM {quote(df._alias)}"""
+    distinct_query = f"""SELECT DISTINCT {pivot_column} FROM {df._quoted_alias}"""
     if pivoted_columns is None:
         pivoted_columns = [row.get(pivot_column) for row in df._apply_query(distinct_query).collect()]
     quoted_pivoted_columns = [f"'{col}'" for col in pivoted_columns]
@@ -127,7 +126,7 @@ def pivot_v2(
         f"""
         |SELECT
         | *
-        |FROM {quote(df._alias)}
+        |FROM {df._quoted_alias}
         |PIVOT({agg_fun}({agg_col}) FOR {pivot_column} IN ({cols_to_str(quoted_pivoted_columns)}))
         |"""
     )
@@ -231,7 +230,7 @@ def unpivot_v1(
         |SELECT
         |{cols_to_str(pivot_columns, 2)},
         |  pivoted.*
-        |FROM {quote(df._alias)}
+        |FROM {df._quoted_alias}
         |LEFT JOIN UNNEST([
         |{cols_to_str(struct_cols, 2)}
         |]) as pivoted
@@ -260,7 +259,7 @@ def unpivot_v2(
         f"""
         |SELECT
         |  *
-        |FROM {quote(df._alias)}
+        |FROM {df._quoted_alias}
         |UNPIVOT {exclude_nulls_str}({value_alias} FOR {key_alias} IN ({cols_to_str(cols)}))
         |"""
     )
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING, Iterable, List, Union
 if TYPE_CHECKING:
     from bigquery_frame.column import Column, LitOrColumn, StringOrColumn
 
+_MARGIN_RE = re.compile(r"\n[ \t\r]*\|")
+
 
 def strip_margin(text: str):
     """For every line in this string, strip a leading prefix consisting of whitespace, tabs and carriage returns
@@ -37,7 +39,7 @@ def strip_margin(text: str):
         c
         d
     """
-    s = re.sub(r"\n[ \t\r]*\|", "\n", text)
+    s = _MARGIN_RE.sub("\n", text)
     if s.startswith("\n"):
         return s[1:]
     else:
@@ -45,7 +47,22 @@ def strip_margin(text: str):
 
 
 def indent(str, nb) -> str:
-    return " " * nb + str.replace("\n", "\n" + " " * nb)
+    padding = " " * nb
+    return padding + str.replace("\n", "\n" + padding)
+
+
+def wrap_cte(quoted_alias: str, query: str) -> str:
+    """Returns the definition of a CTE with the given alias and query, with the query indented.
+
+    Examples:
+
+    >>> print(wrap_cte("`t`", "SELECT *\\nFROM x"))
+    `t` AS (
+      SELECT *
+      FROM x
+    )
+    """
+    return f"{quoted_alias} AS (\n{indent(query, 2)}\n)"
 
 
 def quote(str) -> str:
@@ -65,6 +82,10 @@ def quote(str) -> str:
     '*'
 
     """
+    if str == "*":
+        return str
+    if "." not in str and "`" not in str:
+        return "`" + str + "`"
     return ".".join(["`" + s + "`" if s != "*" else "*" for s in str.replace("`", "").split(".")])
 
 
@@ -1,6 +1,8 @@
+from unittest import mock
+
 import pytest
 from google.api_core.exceptions import BadRequest
-from google.cloud.bigquery import Client
+from google.cloud.bigquery import Client, SchemaField
 
 from bigquery_frame import BigQueryBuilder
 
@@ -28,3 +30,36 @@ def test_with_debug(client: Client):
     df1 = bq.sql("""SELECT 1 as a""")
     with pytest.raises(BadRequest):
         df1.select("b")
+
+
+def test_compute_schemas():
+    """
+    GIVEN a BigQueryBuilder
+    WHEN we compute the schemas of multiple DataFrames at once
+    THEN each query should be sent with the bigquery-frame header exactly once
+     AND each DataFrame should get its schema
+    """
+    header = "/* This query was generated using bigquery-frame"
+    sent_queries = []
+
+    def query_mock(query: str, job_config):
+        sent_queries.append(query)
+        return mock.MagicMock(
+            schema=[SchemaField(name=query[-1], field_type="INTEGER")],
+            session_info=None,
+            estimated_bytes_processed=None,
+            total_bytes_processed=None,
+            total_bytes_billed=None,
+        )
+
+    client = mock.MagicMock()
+    client.query.side_effect = query_mock
+    bq = BigQueryBuilder(client)
+    df1 = bq.sql("""SELECT 1 as a""")
+    df2 = bq.sql("""SELECT 1 as b""")
+    bq._compute_schemas([df1, df2])
+
+    assert len(sent_queries) == 2
+    assert all(query.startswith(header) and query.count(header) == 1 for query in sent_queries)
+    assert df1.schema == [SchemaField(name="a", field_type="INTEGER")]
+    assert df2.schema == [SchemaField(name="b", field_type="INTEGER")]
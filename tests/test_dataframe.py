@@ -1,10 +1,12 @@
+from unittest import mock
+
 import pytest
 from google.api_core.exceptions import BadRequest
 from google.cloud.bigquery import SchemaField
 
 from bigquery_frame import BigQueryBuilder
 from bigquery_frame import functions as f
-from bigquery_frame.dataframe import strip_margin
+from bigquery_frame.dataframe import _merge_deps, strip_margin
 from tests.utils import captured_output
 
 
@@ -45,6 +47,16 @@ def test_createOrReplaceTempView_multiple_times(bq: BigQueryBuilder):
     assert [r["id"] for r in df.collect()] == [2]
 
 
+def test_createOrReplaceTempView_after_compile(bq: BigQueryBuilder):
+    """When we replace a temp view after a DataFrame reading from it has been compiled,
+    the DataFrame should read from the new view"""
+    bq.sql("""SELECT 1 as id""").createOrReplaceTempView("T")
+    df = bq.table("T")
+    assert [r["id"] for r in df.collect()] == [1]
+    bq.sql("""SELECT 2 as id""").createOrReplaceTempView("T")
+    assert [r["id"] for r in df.collect()] == [2]
+
+
 def test_createOrReplaceTempView_cyclic_dependency(bq: BigQueryBuilder):
     """When we call df.createOrReplaceTempView with the same view name multiple times,
     it should overwrite the first view, but beware of cyclic dependencies!"""
@@ -162,7 +174,7 @@ def test_take(bq: BigQueryBuilder):
 
 
 def test_union_with_common_dependency(bq: BigQueryBuilder):
-    """Corner case that requires to use `_dedup_key_value_list` in `_apply_query`"""
+    """Corner case that requires to deduplicate the dependencies with `_merge_deps`"""
     df1 = bq.sql("""SELECT id FROM UNNEST(GENERATE_ARRAY(1, 10, 1)) as id""")
     df2 = df1.where("MOD(id, 2) = 0")
     df3 = df1.where("MOD(id, 2) = 1")
@@ -254,3 +266,33 @@ def test_determinism_with_temp_view(bq: BigQueryBuilder):
     df1 = bq.sql("""SELECT * FROM T1""").withColumn("b", f.lit("b"))
     df2 = bq.sql("""SELECT * FROM T1""").withColumn("b", f.lit("b"))
     assert df1.compile() == df2.compile()
+
+
+def test_schema_is_known_after_collect(bq: BigQueryBuilder):
+    """
+    GIVEN a DataFrame
+    WHEN we collect it
+    THEN its schema should be known without sending another query
+    """
+    df = bq.sql("""SELECT 1 as id""")
+    df.collect()
+    with mock.patch.object(bq, "_get_query_schema") as mocked_get_query_schema:
+        schema = df.schema
+    assert mocked_get_query_schema.call_count == 0
+    assert schema == [SchemaField(name="id", field_type="INTEGER", mode="NULLABLE")]
+
+
+def test_merge_deps():
+    """
+    GIVEN DataFrames with a diamond dependency: df2 and df3 both derive from df1
+    WHEN we merge their dependencies
+    THEN each alias should appear only once, at the position where it was first found
+    """
+    bq = BigQueryBuilder(mock.MagicMock())
+    df1 = bq.sql("""SELECT 1 as id""")
+    df2 = df1.where("id = 1")
+    df3 = df1.where("id = 2")
+
+    assert _merge_deps([df2, df3]) == [(df1._alias, df1), (df2._alias, df2), (df3._alias, df3)]
+    assert _merge_deps([df3, df2]) == [(df1._alias, df1), (df3._alias, df3), (df2._alias, df2)]
+    assert _merge_deps([df1, df2]) == [(df1._alias, df1), (df2._alias, df2)]
@@ -1,8 +1,9 @@
+import threading
 from unittest import mock
 
 import pytest
 from google.api_core.exceptions import BadRequest, InternalServerError
-from google.cloud.bigquery import Client
+from google.cloud.bigquery import Client, SchemaField
 
 from bigquery_frame.has_bigquery_client import HasBigQueryClient
 from bigquery_frame.utils import strip_margin
@@ -110,3 +111,49 @@ def test_cache_disabled(client: Client, random_test_dataset: str):
     assert bq_client.stats.estimated_bytes_processed == 8 * 2
     assert bq_client.stats.total_bytes_processed == 8 * 2
     assert bq_client.stats.total_bytes_billed == 10 * 1024 * 1024 * 2
+
+
+def test_get_query_schemas(client: Client):
+    """
+    GIVEN a HasBigQueryClient
+    WHEN we get the schemas of multiple queries at once
+    THEN each schema should be returned in the same order as the queries
+    """
+    bq_client = HasBigQueryClient(client)
+    schemas = bq_client._get_query_schemas(["SELECT 1 as a", "SELECT 'b' as b", "SELECT 1.0 as c"])
+    expected = [
+        [SchemaField(name="a", field_type="INTEGER", mode="NULLABLE")],
+        [SchemaField(name="b", field_type="STRING", mode="NULLABLE")],
+        [SchemaField(name="c", field_type="FLOAT", mode="NULLABLE")],
+    ]
+    assert schemas == expected
+
+
+def test_get_query_schemas_without_session():
+    """
+    GIVEN a HasBigQueryClient using sessions, with no session opened yet
+    WHEN we get the schemas of multiple queries at once
+    THEN the dry-run jobs should all be running at the same time
+     AND none of them should open a session
+    """
+    barrier = threading.Barrier(2, timeout=10)
+    job_configs = []
+
+    def query_mock(query: str, job_config):
+        job_configs.append(job_config)
+        barrier.wait()
+        return mock.MagicMock(
+            schema=[SchemaField(name=query, field_type="INTEGER")],
+            session_info=None,
+            estimated_bytes_processed=None,
+            total_bytes_processed=None,
+            total_bytes_billed=None,
+        )
+
+    client = mock.MagicMock()
+    client.query.side_effect = query_mock
+    bq_client = HasBigQueryClient(client, use_session=True)
+    schemas = bq_client._get_query_schemas(["a", "b"])
+
+    assert schemas == [[SchemaField(name="a", field_type="INTEGER")], [SchemaField(name="b", field_type="INTEGER")]]
+    assert all(not job_config.create_session for job_config in job_configs)
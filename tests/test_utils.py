@@ -1,5 +1,4 @@
-from bigquery_frame.dataframe import strip_margin
-from bigquery_frame.utils import number_lines
+from bigquery_frame.utils import number_lines, strip_margin
 
 
 def test_number_lines():